@@ -0,0 +1,116 @@
+"""Benchmark de inicialização a frio do app_obras.
+
+Cada medição roda em um processo Python novo, como acontece quando o
+container (ou o servidor Streamlit) sobe do zero:
+
+  1. Import dos módulos pesados (pandas, gspread, google-auth), isoladamente.
+  2. Servidor: do início do processo `streamlit run` até /_stcore/health responder.
+  3. Primeira renderização interativa: do início do processo até a tela de
+     login estar renderizada (script executado com o AppTest do Streamlit).
+
+Uso:
+    python benchmark_startup.py [--repeticoes N] [--porta PORTA]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+APP = os.path.join(DIRETORIO, "app_obras.py")
+
+MODULOS_PESADOS = ["pandas", "gspread", "google.oauth2.service_account"]
+
+# Executado em um processo novo: mede do início do interpretador até o login renderizado
+SCRIPT_PRIMEIRA_RENDERIZACAO = """
+import time
+from streamlit.testing.v1 import AppTest
+inicio = time.perf_counter()
+at = AppTest.from_file({app!r}, default_timeout=60)
+at.run()
+fim = time.perf_counter()
+assert not at.exception, at.exception
+assert any(w.label == "Usuário" for w in at.sidebar.text_input), "tela de login não renderizada"
+print(fim - inicio)
+"""
+
+
+def _tempo_processo(codigo):
+    """Roda um trecho de código em um processo novo e retorna o tempo total (s) e a saída."""
+    inicio = time.perf_counter()
+    resultado = subprocess.run([sys.executable, "-c", codigo], cwd=DIRETORIO, capture_output=True, text=True, check=True)
+    return time.perf_counter() - inicio, resultado.stdout.strip()
+
+
+def medir_imports():
+    """Tempo de import de cada módulo pesado, em um processo novo por módulo."""
+    tempos = {}
+    for modulo in MODULOS_PESADOS:
+        _, saida = _tempo_processo(
+            f"import time; t = time.perf_counter(); import {modulo}; print(time.perf_counter() - t)"
+        )
+        tempos[modulo] = float(saida)
+    return tempos
+
+
+def medir_servidor(porta, timeout=60):
+    """Tempo do início do `streamlit run` até o endpoint de saúde do servidor responder."""
+    comando = [
+        sys.executable, "-m", "streamlit", "run", APP,
+        "--server.headless", "true", "--server.port", str(porta),
+        "--browser.gatherUsageStats", "false",
+    ]
+    inicio = time.perf_counter()
+    processo = subprocess.Popen(comando, cwd=DIRETORIO, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - inicio < timeout:
+            try:
+                with urllib.request.urlopen(f"http://localhost:{porta}/_stcore/health", timeout=1) as resposta:
+                    if resposta.status == 200:
+                        return time.perf_counter() - inicio
+            except OSError:
+                time.sleep(0.05)
+        raise TimeoutError(f"Servidor não respondeu em {timeout}s")
+    finally:
+        processo.terminate()
+        processo.wait()
+
+
+def medir_primeira_renderizacao():
+    """Tempo do início do processo até a tela de login renderizada e o tempo só do script."""
+    total, saida = _tempo_processo(SCRIPT_PRIMEIRA_RENDERIZACAO.format(app=APP))
+    return total, float(saida.splitlines()[-1])
+
+
+def _resumo(valores):
+    return f"mediana {statistics.median(valores):.3f}s (min {min(valores):.3f}s, max {max(valores):.3f}s)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--porta", type=int, default=8599)
+    args = parser.parse_args()
+
+    print("== Import dos módulos pesados (processo novo) ==")
+    for modulo, tempo in medir_imports().items():
+        print(f"  {modulo:<32} {tempo:.3f}s")
+
+    servidor, renderizacao, script = [], [], []
+    for _ in range(args.repeticoes):
+        servidor.append(medir_servidor(args.porta))
+        total, tempo_script = medir_primeira_renderizacao()
+        renderizacao.append(total)
+        script.append(tempo_script)
+
+    print(f"== {args.repeticoes} repetições ==")
+    print(f"  Início do processo -> servidor pronto (/_stcore/health): {_resumo(servidor)}")
+    print(f"  Início do processo -> login renderizado:                 {_resumo(renderizacao)}")
+    print(f"    dos quais execução do script até o login:              {_resumo(script)}")
+
+
+if __name__ == "__main__":
+    main()
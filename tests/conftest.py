@@ -0,0 +1,97 @@
+"""Fixtures compartilhadas: planilha falsa em memória e journal em diretório temporário."""
+import os
+import sys
+
+import pytest
+from gspread.exceptions import WorksheetNotFound
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app_obras  # noqa: E402
+
+
+class AbaFalsa:
+    """Aba em memória com o subconjunto da API do gspread usado pelo app."""
+
+    def __init__(self, linhas):
+        self.linhas = [list(linha) for linha in linhas]
+        self.row_count = max(len(self.linhas), 1)
+
+    def get_all_records(self):
+        return [dict(zip(self.linhas[0], linha)) for linha in self.linhas[1:]]
+
+    def get_all_values(self, **kwargs):
+        return [list(linha) for linha in self.linhas]
+
+    def batch_update(self, atualizacoes):
+        for atualizacao in atualizacoes:
+            linha = int(atualizacao["range"].split(":")[0][1:])
+            self.linhas[linha - 1] = list(atualizacao["values"][0])
+
+    def append_rows(self, linhas, **kwargs):
+        self.linhas += [list(linha) for linha in linhas]
+        self.row_count = max(self.row_count, len(self.linhas))
+
+    def append_row(self, linha, **kwargs):
+        self.append_rows([linha])
+
+    def update(self, range_name=None, values=None, **kwargs):
+        inicio = int(range_name.split(":")[0][1:])
+        for i, linha in enumerate(values):
+            while len(self.linhas) < inicio + i:
+                self.linhas.append([])
+            self.linhas[inicio - 1 + i] = list(linha)
+
+    def add_rows(self, quantidade):
+        self.row_count += quantidade
+
+    def resize(self, rows=None, **kwargs):
+        self.linhas = self.linhas[:rows]
+        self.row_count = rows
+
+
+class PlanilhaFalsa:
+    def __init__(self, abas):
+        self.abas = abas
+
+    def worksheet(self, nome):
+        if nome not in self.abas:
+            raise WorksheetNotFound(nome)
+        return self.abas[nome]
+
+    def add_worksheet(self, nome, **kwargs):
+        self.abas[nome] = AbaFalsa([])
+        return self.abas[nome]
+
+
+@pytest.fixture(autouse=True)
+def arquivos_locais(tmp_path, monkeypatch):
+    """Journal e estado do resumo sempre em diretório temporário, nunca ao lado do app."""
+    monkeypatch.setattr(app_obras, "JOURNAL_ARQUIVO", str(tmp_path / "journal.jsonl"))
+    monkeypatch.setattr(app_obras, "RESUMO_ESTADO_ARQUIVO", str(tmp_path / "resumo_estado.json"))
+
+
+@pytest.fixture
+def journal():
+    """Journal vazio e estado de sincronização novo."""
+    app_obras.get_estado_sync.clear()
+    yield app_obras.JOURNAL_ARQUIVO
+    app_obras.get_estado_sync.clear()
+
+
+@pytest.fixture
+def planilhas(monkeypatch):
+    """Google Sheets falso: {nome da planilha: {nome da aba: AbaFalsa}}, com o shard padrão."""
+    livro = {
+        app_obras.PLANILHA_NOME: {
+            app_obras.ABA_INFO: AbaFalsa([app_obras.COLUNAS_INFO]),
+            app_obras.ABA_DESPESAS: AbaFalsa([app_obras.COLUNAS_DESPESAS]),
+        }
+    }
+    cliente = object()
+    monkeypatch.setattr(app_obras, "get_gspread_client", lambda: cliente)
+    monkeypatch.setattr(app_obras, "get_planilha", lambda gc, nome: PlanilhaFalsa(livro[nome]))
+    monkeypatch.setattr(app_obras, "get_shards_despesas", lambda: app_obras.SHARDS_DESPESAS_PADRAO)
+    app_obras.limpar_cache_dados()
+    yield livro
+    app_obras.limpar_cache_dados()
@@ -0,0 +1,139 @@
+"""API HTTP de leitura: rotas, indisponibilidade da planilha e ETag."""
+import gzip
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import app_obras
+
+
+@pytest.fixture
+def obras(planilhas):
+    abas = planilhas[app_obras.PLANILHA_NOME]
+    abas[app_obras.ABA_INFO].linhas += [[1, "Casa", 100.0, "2024-01-01"], [2, "Galpão", 50.0, "2024-02-01"]]
+    abas[app_obras.ABA_DESPESAS].linhas += [[1, 2, "2024-01-15", 30.0], [1, 1, "2024-01-08", 10.0], [2, 1, "2024-02-05", 80.0]]
+    return planilhas
+
+
+def test_rota_obras(obras):
+    status, corpo = app_obras._rotear_api("/api/obras")
+    assert status == 200
+    assert [(o["Obra_ID"], o["Gasto_Total_Acumulado"], o["Sobrando_Financeiro"]) for o in corpo] == [(1, 40.0, 60.0), (2, 80.0, -30.0)]
+
+
+def test_rota_resumo(obras):
+    status, corpo = app_obras._rotear_api("/api/resumo")
+    assert status == 200
+    assert corpo == {"qtd_obras": 2, "orcamento_total": 150.0, "gasto_total": 120.0, "saldo_total": 30.0, "obras_acima_orcamento": 1}
+
+
+def test_rota_obra_e_despesas(obras):
+    status, corpo = app_obras._rotear_api("/api/obras/2")
+    assert (status, corpo["Nome_Obra"]) == (200, "Galpão")
+
+    status, corpo = app_obras._rotear_api("/api/obras/1/despesas")
+    assert status == 200
+    assert [d["Semana_Ref"] for d in corpo] == [1, 2]
+
+
+@pytest.mark.parametrize("caminho", ["/api/obras/99", "/api/obras/99/despesas", "/api/obras/abc", "/api", "/"])
+def test_rota_inexistente(obras, caminho):
+    assert app_obras._rotear_api(caminho)[0] == 404
+
+
+def test_planilha_vazia_nao_e_erro(planilhas):
+    assert app_obras._rotear_api("/api/obras") == (200, [])
+
+
+def test_falha_de_leitura_nao_vira_lista_vazia(obras, monkeypatch):
+    def sem_rede(gc, nome):
+        raise ConnectionError("timeout")
+
+    monkeypatch.setattr(app_obras, "get_planilha", sem_rede)
+    with pytest.raises(app_obras.PlanilhaIndisponivel):
+        app_obras._rotear_api("/api/obras")
+
+
+@pytest.fixture
+def servidor(obras):
+    servidor = app_obras.criar_servidor_api({"porta": 0})
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{servidor.server_address[1]}"
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def _get(url, **cabecalhos):
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=cabecalhos)) as resposta:
+            return resposta.status, resposta.headers, resposta.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_etag_por_representacao(servidor):
+    status, cabecalhos, _ = _get(servidor + "/api/obras")
+    status_gzip, cabecalhos_gzip, corpo_gzip = _get(servidor + "/api/obras", **{"Accept-Encoding": "gzip"})
+    assert status == status_gzip == 200
+    assert json.loads(gzip.decompress(corpo_gzip))[0]["Obra_ID"] == 1
+    assert cabecalhos["ETag"] != cabecalhos_gzip["ETag"]
+
+    assert _get(servidor + "/api/obras", **{"If-None-Match": cabecalhos["ETag"]})[0] == 304
+    assert _get(servidor + "/api/obras", **{"If-None-Match": cabecalhos["ETag"], "Accept-Encoding": "gzip"})[0] == 200
+
+
+def test_planilha_indisponivel_responde_503(servidor, monkeypatch):
+    def sem_rede(gc, nome):
+        raise ConnectionError("timeout")
+
+    monkeypatch.setattr(app_obras, "get_planilha", sem_rede)
+    status, cabecalhos, _ = _get(servidor + "/api/obras")
+    assert status == 503
+    assert cabecalhos["Retry-After"] == str(app_obras.API_RETRY_AFTER_SEGUNDOS)
+
+
+def test_fora_do_loopback_exige_token():
+    with pytest.raises(ValueError):
+        app_obras.criar_servidor_api({"host": "0.0.0.0", "porta": 0})
+
+
+@pytest.mark.parametrize("accept_encoding, esperado", [
+    ("gzip", True),
+    ("gzip, deflate, br", True),
+    ("GZIP;q=0.5", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.0, identity", False),
+    ("*", True),
+    ("*;q=0", False),
+    ("identity, *;q=0", False),
+    ("br, *;q=0.1", True),
+    ("", False),
+])
+def test_aceita_gzip(accept_encoding, esperado):
+    assert app_obras._aceita_gzip(accept_encoding) is esperado
+
+
+@pytest.mark.parametrize("if_none_match, esperado", [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"x", W/"abc"', True),
+    ("*", True),
+    ('"abc-gzip"', False),
+    ("", False),
+])
+def test_etag_confere(if_none_match, esperado):
+    assert app_obras._etag_confere(if_none_match, '"abc"') is esperado
+
+
+def test_304_repete_cabecalhos_de_cache(servidor):
+    _, cabecalhos, _ = _get(servidor + "/api/obras", **{"Accept-Encoding": "gzip;q=0"})
+    assert "Content-Encoding" not in cabecalhos
+
+    status, cabecalhos_304, _ = _get(servidor + "/api/obras", **{"If-None-Match": "W/" + cabecalhos["ETag"]})
+    assert status == 304
+    assert cabecalhos_304["ETag"] == cabecalhos["ETag"]
+    assert cabecalhos_304["Cache-Control"] == "no-cache"
+    assert cabecalhos_304["Vary"] == "Accept-Encoding"
@@ -0,0 +1,106 @@
+"""Journal local: reprocessamento após reinício, confirmação, rejeição e compactação."""
+import json
+
+import app_obras
+
+
+def _registros(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        return [json.loads(linha) for linha in f]
+
+
+def test_entradas_sem_ack_sao_reprocessadas_na_ordem(journal):
+    primeiro = app_obras.journal_append("insert_obra", [1, "A", 100.0, "2024-01-01"])
+    segundo = app_obras.journal_append("insert_despesa", [1, 1, "2024-01-08", 10.0])
+
+    # Simula um reinício do processo: o estado em memória é recriado
+    app_obras.get_estado_sync.clear()
+
+    assert [e["id"] for e in app_obras.journal_pendentes()] == [primeiro, segundo]
+
+
+def test_linha_parcial_e_ignorada(journal):
+    id_entrada = app_obras.journal_append("insert_obra", [1, "A", 100.0, "2024-01-01"])
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write('{"id": "incompleta", "op": "ins')  # queda no meio da gravação
+
+    assert [e["id"] for e in app_obras.journal_pendentes()] == [id_entrada]
+
+
+def test_escrita_apos_linha_parcial_nao_se_perde(journal):
+    primeiro = app_obras.journal_append("insert_obra", [1, "A", 100.0, "2024-01-01"])
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write('{"id": "x", "op": "ins')  # queda no meio da gravação
+    segundo = app_obras.journal_append("insert_obra", [2, "B", 200.0, "2024-01-01"])
+
+    assert [e["id"] for e in app_obras.journal_pendentes()] == [primeiro, segundo]
+
+
+def test_registros_que_nao_sao_objetos_sao_ignorados(journal):
+    with open(journal, "w", encoding="utf-8") as f:
+        f.write('1\n"texto"\n[1, 2]\nnull\n{"sem_id": true}\n')
+    id_entrada = app_obras.journal_append("insert_obra", [1, "A", 100.0, "2024-01-01"])
+
+    assert [e["id"] for e in app_obras.journal_pendentes()] == [id_entrada]
+    assert app_obras.journal_rejeitadas() == []
+
+
+def test_confirmar_compacta_quando_nao_ha_pendencias(journal):
+    primeiro = app_obras.journal_append("insert_obra", [1, "A", 100.0, "2024-01-01"])
+    segundo = app_obras.journal_append("insert_obra", [2, "B", 200.0, "2024-01-01"])
+
+    app_obras.journal_confirmar([primeiro])
+    assert [e["id"] for e in app_obras.journal_pendentes()] == [segundo]
+    assert len(_registros(journal)) == 3  # ainda há pendência: sem compactação
+
+    app_obras.journal_confirmar([segundo])
+    assert app_obras.journal_pendentes() == []
+    assert _registros(journal) == []
+
+
+def test_compactacao_preserva_rejeitadas(journal):
+    rejeitada = app_obras.journal_append("insert_despesa", [1, 1, "2024-01-08", 10.0])
+    confirmada = app_obras.journal_append("insert_obra", [2, "B", 200.0, "2024-01-01"])
+
+    app_obras.journal_rejeitar([(rejeitada, "Aba inexistente.")])
+    app_obras.journal_confirmar([confirmada])
+
+    registros = _registros(journal)
+    assert [r.get("id") or r.get("rejeitado") for r in registros] == [rejeitada, rejeitada]
+    assert app_obras.journal_pendentes() == []
+    [entrada] = app_obras.journal_rejeitadas()
+    assert entrada["id"] == rejeitada
+    assert entrada["motivo"] == "Aba inexistente."
+
+    # Descartar (ack) remove a rejeitada na próxima compactação
+    app_obras.journal_confirmar([rejeitada])
+    assert app_obras.journal_rejeitadas() == []
+    assert _registros(journal) == []
+
+
+def test_upsert_pendentes_sobrepoe_pela_chave(journal):
+    app_obras.journal_append("update_despesa", [1, 2, "2024-01-15", 50.0])
+    app_obras.journal_append("insert_despesa", [2, 1, "2024-01-08", 7.0])
+    df = app_obras.pd.DataFrame(
+        [[1, 1, "2024-01-08", 10.0], [1, 2, "2024-01-15", 20.0]], columns=app_obras.COLUNAS_DESPESAS
+    )
+
+    resultado = app_obras.aplicar_pendentes_despesas(df)
+    assert resultado[["Obra_ID", "Semana_Ref", "Gasto_Semana"]].values.tolist() == [[1, 1, 10.0], [1, 2, 50.0], [2, 1, 7.0]]
+
+    so_obra_2 = app_obras.aplicar_pendentes_despesas(app_obras.pd.DataFrame(columns=app_obras.COLUNAS_DESPESAS), obra_id=2)
+    assert so_obra_2["Obra_ID"].tolist() == [2]
+
+
+def test_reenfileirar_devolve_rejeitada_a_fila(journal):
+    id_entrada = app_obras.journal_append("insert_despesa", [9, 1, "2024-01-08", 10.0])
+    app_obras.journal_rejeitar([(id_entrada, "Aba inexistente.")])
+    assert app_obras.journal_pendentes() == []
+
+    app_obras.journal_reenfileirar([id_entrada])
+    assert [e["id"] for e in app_obras.journal_pendentes()] == [id_entrada]
+    assert app_obras.journal_rejeitadas() == []
+
+    # Uma nova rejeição depois do reenvio volta a valer
+    app_obras.journal_rejeitar([(id_entrada, "Ainda inexistente.")])
+    assert [e["motivo"] for e in app_obras.journal_rejeitadas()] == ["Ainda inexistente."]
@@ -0,0 +1,94 @@
+"""Resumo_Obras: reconstrução completa e atualização incremental."""
+import time
+
+import pytest
+
+import app_obras
+
+
+@pytest.fixture
+def obras(journal, planilhas):
+    abas = planilhas[app_obras.PLANILHA_NOME]
+    abas[app_obras.ABA_INFO].linhas += [[1, "Casa", 100.0, "2024-01-01"], [2, "Galpão", 50.0, "2024-02-01"]]
+    abas[app_obras.ABA_DESPESAS].linhas += [[1, 1, "2024-01-08", 10.0], [1, 2, "2024-01-15", 30.0], [2, 1, "2024-02-05", 80.0]]
+    return abas
+
+
+def _criar_resumo(planilhas, linhas):
+    aba = app_obras.get_planilha(None, app_obras.PLANILHA_NOME).add_worksheet(app_obras.ABA_RESUMO)
+    aba.append_rows([app_obras.COLUNAS_RESUMO] + linhas)
+    return aba
+
+
+def _espionar_escritas(aba, monkeypatch):
+    escritas = []
+    for metodo in ("update", "batch_update", "append_rows", "append_row"):
+        original = getattr(aba, metodo)
+        monkeypatch.setattr(aba, metodo, lambda *a, _m=metodo, _o=original, **k: (escritas.append(_m), _o(*a, **k))[1])
+    return escritas
+
+
+def test_reconstrucao_em_uma_escrita_remove_linhas_antigas(obras, monkeypatch):
+    aba = _criar_resumo(obras, [[i, 1.0, 1.0, 1, 0.0] for i in range(1, 8)])
+    escritas = _espionar_escritas(aba, monkeypatch)
+    app_obras.marcar_resumo_desatualizado()
+
+    antes = time.time()
+    app_obras.reconstruir_resumo(object())
+
+    assert escritas == ["update"]
+    assert aba.linhas == [
+        app_obras.COLUNAS_RESUMO,
+        [1, 100.0, 40.0, 2, 60.0],
+        [2, 50.0, 80.0, 1, -30.0],
+    ]
+    assert aba.row_count == 3
+    assert not app_obras.resumo_desatualizado()
+    assert app_obras._ler_estado_resumo()["ultima_reconciliacao"] >= antes
+
+
+def test_reconstrucao_aumenta_a_aba_quando_falta_espaco(obras):
+    aba = _criar_resumo(obras, [])
+    aba.row_count = 1
+    app_obras.reconstruir_resumo(object())
+    assert aba.row_count == 3
+    assert [linha[0] for linha in aba.linhas[1:]] == [1, 2]
+
+
+def test_reconstrucao_sem_obras_deixa_so_o_cabecalho(journal, planilhas):
+    aba = _criar_resumo(planilhas, [[1, 100.0, 40.0, 2, 60.0], [2, 50.0, 80.0, 1, -30.0]])
+    app_obras.reconstruir_resumo(object())
+    assert aba.linhas == [app_obras.COLUNAS_RESUMO]
+    assert aba.row_count == 1
+
+
+def test_aba_criada_fica_marcada_ate_a_reconstrucao(obras):
+    assert not app_obras.resumo_desatualizado()
+
+    planilha = app_obras.get_planilha(None, app_obras.PLANILHA_NOME)
+    app_obras.atualizar_resumo(planilha, {1: (5.0, 3)}, {})
+    assert app_obras.ABA_RESUMO in obras
+    assert app_obras.resumo_desatualizado()  # a aba nova não tem o histórico
+
+    app_obras.reconstruir_resumo(object())
+    assert obras[app_obras.ABA_RESUMO].linhas[1] == [1, 100.0, 40.0, 2, 60.0]
+    assert not app_obras.resumo_desatualizado()
+
+
+def test_atualizacao_incremental(obras):
+    aba = _criar_resumo(obras, [[1, 100.0, 40.0, 2, 60.0]])
+    planilha = app_obras.get_planilha(None, app_obras.PLANILHA_NOME)
+
+    app_obras.atualizar_resumo(planilha, {1: (-5.0, 3)}, {3: 70.0})
+
+    assert aba.linhas[1:] == [[1, 100.0, 35.0, 3, 65.0], [3, 70.0, 0.0, 0, 70.0]]
+
+
+def test_primeira_linha_por_despesa_usa_o_orcamento_da_obra(obras):
+    # Obra 2 já existe em Obras_Info, mas ainda não tem linha no resumo
+    aba = _criar_resumo(obras, [[1, 100.0, 40.0, 2, 60.0]])
+    planilha = app_obras.get_planilha(None, app_obras.PLANILHA_NOME)
+
+    app_obras.atualizar_resumo(planilha, {2: (80.0, 1)}, {})
+
+    assert aba.linhas[2] == [2, 50.0, 80.0, 1, -30.0]
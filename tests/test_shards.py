@@ -0,0 +1,99 @@
+"""Roteamento das despesas entre shards."""
+import pytest
+
+import app_obras
+
+SHARDS = [
+    {"planilha": "Controle_Obras", "aba": "Despesas_Sul", "obra_ids": [121, 130]},
+    {"planilha": "Despesas_2024", "aba": "Despesas", "obra_id_min": 1, "obra_id_max": 100},
+    {"planilha": "Despesas_2025", "aba": "Despesas", "obra_id_min": 101, "obra_id_max": 500},
+    {"planilha": "Controle_Obras", "aba": "Despesas_Semanas"},
+]
+
+
+@pytest.fixture
+def shards(monkeypatch):
+    monkeypatch.setattr(app_obras.st, "secrets", {"shards_despesas": SHARDS})
+    return SHARDS
+
+
+@pytest.mark.parametrize("obra_id, aba", [
+    (121, ("Controle_Obras", "Despesas_Sul")),    # lista explícita vence as faixas
+    ("130", ("Controle_Obras", "Despesas_Sul")),
+    (5, ("Despesas_2024", "Despesas")),
+    (100, ("Despesas_2024", "Despesas")),
+    (101, ("Despesas_2025", "Despesas")),
+    (122, ("Despesas_2025", "Despesas")),
+    (501, ("Controle_Obras", "Despesas_Semanas")),   # nenhuma regra: o shard sem critério
+])
+def test_get_shard_obra(shards, obra_id, aba):
+    shard = app_obras.get_shard_obra(obra_id)
+    assert (shard["planilha"], shard["aba"]) == aba
+
+
+@pytest.mark.parametrize("tabela", [None, [], {}])
+def test_sem_tabela_usa_shard_padrao(monkeypatch, tabela):
+    monkeypatch.setattr(app_obras.st, "secrets", {"shards_despesas": tabela})
+    assert app_obras.get_shards_despesas() == app_obras.SHARDS_DESPESAS_PADRAO
+    assert app_obras.get_shard_obra(7) == app_obras.SHARDS_DESPESAS_PADRAO[0]
+
+
+@pytest.mark.parametrize("tabela", [
+    "Despesas",
+    [{"planilha": "Controle_Obras"}],
+    [{"planilha": "", "aba": "Despesas"}],
+    [{"planilha": "P", "aba": "A", "obra_ids": ["x"]}, {"planilha": "P", "aba": "B"}],
+    [{"planilha": "P", "aba": "A", "obra_id_min": None}, {"planilha": "P", "aba": "B"}],
+    [{"planilha": "P", "aba": "A"}, "P/B"],
+    [{"planilha": "P", "aba": "A", "obra_ids": [1]}, {"planilha": "P", "aba": "B", "obra_id_max": 10}],  # sem shard final sem critério
+])
+def test_tabela_malformada_suspende_o_roteamento(monkeypatch, tabela):
+    monkeypatch.setattr(app_obras.st, "secrets", {"shards_despesas": tabela})
+    with pytest.raises(app_obras.TabelaShardsInvalida):
+        app_obras.get_shard_obra(7)
+    with pytest.raises(app_obras.PlanilhaIndisponivel):
+        app_obras._carregar_despesas_obra(7)
+
+
+def test_tabela_malformada_mantem_despesas_na_fila(journal, planilhas, monkeypatch):
+    monkeypatch.setattr(app_obras, "get_shards_despesas", lambda: app_obras._validar_shards([{"planilha": ""}]))
+    despesa = app_obras.journal_append("insert_despesa", [1, 1, "2024-01-08", 10.0])
+    app_obras.journal_append("insert_obra", [1, "A", 100.0, "2024-01-01"])
+
+    with pytest.raises(app_obras.TabelaShardsInvalida):
+        app_obras.sincronizar_journal(object())
+
+    # A obra é sincronizada; a despesa não vai para a aba padrão nem é rejeitada
+    assert [e["id"] for e in app_obras.journal_pendentes()] == [despesa]
+    assert app_obras.journal_rejeitadas() == []
+    assert planilhas[app_obras.PLANILHA_NOME][app_obras.ABA_DESPESAS].linhas[1:] == []
+
+
+def test_validar_shards_normaliza_ids():
+    shard, _ = app_obras._validar_shards([
+        {"planilha": "P", "aba": "A", "obra_ids": ["3", 4.0], "obra_id_max": "9"},
+        {"planilha": "P", "aba": "B"},
+    ])
+    assert shard["obra_ids"] == [3, 4]
+    assert shard["obra_id_max"] == 9
+
+
+def test_ler_todos_shards_le_cada_aba_uma_vez_e_so_as_obras_roteadas(planilhas, monkeypatch):
+    abas = planilhas[app_obras.PLANILHA_NOME]
+    sul = app_obras.get_planilha(None, app_obras.PLANILHA_NOME).add_worksheet("Despesas_Sul")
+    sul.append_rows([app_obras.COLUNAS_DESPESAS, [121, 1, "2024-01-08", 7.0]])
+    # Histórico da obra 121 que ficou na aba original antes de ela ir para o Sul
+    abas[app_obras.ABA_DESPESAS].linhas += [[1, 1, "2024-01-08", 10.0], [121, 1, "2024-01-08", 99.0]]
+    tabela = [
+        {"planilha": app_obras.PLANILHA_NOME, "aba": "Despesas_Sul", "obra_ids": [121]},
+        {"planilha": app_obras.PLANILHA_NOME, "aba": app_obras.ABA_DESPESAS, "obra_id_max": 100},
+        {"planilha": app_obras.PLANILHA_NOME, "aba": app_obras.ABA_DESPESAS},
+    ]
+    monkeypatch.setattr(app_obras, "get_shards_despesas", lambda: tabela)
+
+    df = app_obras._ler_todos_shards(object())
+
+    assert sorted(df[["Obra_ID", "Gasto_Semana"]].values.tolist()) == [[1, 10.0], [121, 7.0]]
+    assert df.groupby("Obra_ID")["Gasto_Semana"].sum().to_dict() == {
+        obra_id: app_obras.load_despesas_obra(obra_id)["Gasto_Semana"].sum() for obra_id in (1, 121)
+    }
@@ -0,0 +1,134 @@
+"""Sincronização do journal com a planilha: chave natural, upsert, conflitos e resumo incremental."""
+import pytest
+from gspread.exceptions import SpreadsheetNotFound
+
+import app_obras
+
+
+@pytest.mark.parametrize("row, tamanho, esperado", [
+    ([7, "Obra", 10.0, "2024-01-01"], 1, (7,)),
+    (["7", "3", "2024-01-01", 1.0], 2, (7, 3)),
+    ([7.0, " 3 ", "", 0], 2, (7, 3)),
+    (["", "", "", ""], 2, (0, 0)),
+    (["abc", 1, "", 0], 1, None),
+])
+def test_chave_linha(row, tamanho, esperado):
+    assert app_obras._chave_linha(row, tamanho) == esperado
+
+
+def _aba_despesas(planilhas):
+    return planilhas[app_obras.PLANILHA_NOME][app_obras.ABA_DESPESAS]
+
+
+def test_update_faz_upsert_e_insert_acrescenta(planilhas):
+    aba = _aba_despesas(planilhas)
+    aba.linhas.append([1, 1, "2024-01-08", 10.0])
+    planilha = app_obras.get_planilha(None, app_obras.PLANILHA_NOME)
+    entradas = [
+        {"id": "a", "op": "update_despesa", "row": [1, 1, "2024-01-08", 25.0]},
+        {"id": "b", "op": "insert_despesa", "row": [1, 2, "2024-01-15", 5.0]},
+        {"id": "c", "op": "update_despesa", "row": [1, 3, "2024-01-22", 4.0]},
+    ]
+
+    mudancas, conflitos = app_obras._sincronizar_aba(planilha, app_obras.ABA_DESPESAS, entradas, 2)
+
+    assert conflitos == []
+    assert aba.linhas[1:] == [[1, 1, "2024-01-08", 25.0], [1, 2, "2024-01-15", 5.0], [1, 3, "2024-01-22", 4.0]]
+    assert mudancas[0] == ([1, 1, "2024-01-08", 10.0], [1, 1, "2024-01-08", 25.0])
+    assert [antiga for antiga, _ in mudancas[1:]] == [None, None]
+
+
+def test_insert_em_chave_existente(planilhas):
+    aba = _aba_despesas(planilhas)
+    aba.linhas.append([1, 1, "2024-01-08", 10.0])
+    planilha = app_obras.get_planilha(None, app_obras.PLANILHA_NOME)
+    entradas = [
+        {"id": "reenvio", "op": "insert_despesa", "row": [1, 1, "2024-01-08", 10]},
+        {"id": "conflito", "op": "insert_despesa", "row": [1, 1, "2024-01-08", 99.0]},
+    ]
+
+    mudancas, conflitos = app_obras._sincronizar_aba(planilha, app_obras.ABA_DESPESAS, entradas, 2)
+
+    # Reenvio idêntico é ignorado; conteúdo diferente nunca sobrescreve
+    assert mudancas == []
+    assert [entrada["id"] for entrada, _ in conflitos] == ["conflito"]
+    assert aba.linhas[1:] == [[1, 1, "2024-01-08", 10.0]]
+
+
+def test_sincronizar_journal_aplica_confirma_e_atualiza_resumo(journal, planilhas):
+    abas = planilhas[app_obras.PLANILHA_NOME]
+    abas[app_obras.ABA_INFO].linhas.append([1, "A", 100.0, "2024-01-01"])
+    _aba_despesas(planilhas).linhas.append([1, 1, "2024-01-08", 10.0])
+    resumo = app_obras.get_planilha(None, app_obras.PLANILHA_NOME).add_worksheet(app_obras.ABA_RESUMO)
+    resumo.append_rows([app_obras.COLUNAS_RESUMO, [1, 100.0, 10.0, 1, 90.0]])
+
+    app_obras.journal_append("update_despesa", [1, 1, "2024-01-08", 30.0])   # +20
+    app_obras.journal_append("insert_despesa", [1, 2, "2024-01-15", 5.0])    # +5
+    app_obras.journal_append("update_obra", [1, "A", 150.0, "2024-01-01"])   # novo orçamento
+    app_obras.journal_append("insert_obra", [2, "B", 50.0, "2024-02-01"])
+    conflito = app_obras.journal_append("insert_despesa", [1, 1, "2024-01-08", 1.0])
+    malformada = app_obras.journal_append("insert_despesa", [1, 3])
+
+    assert app_obras.sincronizar_journal(object()) == 6
+
+    assert app_obras.journal_pendentes() == []
+    assert {e["id"] for e in app_obras.journal_rejeitadas()} == {conflito, malformada}
+    assert resumo.linhas[1:] == [
+        [1, 150.0, 35.0, 2, 115.0],
+        [2, 50.0, 0.0, 0, 50.0],
+    ]
+
+
+def test_destino_inexistente_e_rejeitado_sem_bloquear_os_demais(journal, planilhas, monkeypatch):
+    shards = [
+        {"planilha": app_obras.PLANILHA_NOME, "aba": "Despesas_Sul", "obra_ids": [9]},
+        {"planilha": app_obras.PLANILHA_NOME, "aba": app_obras.ABA_DESPESAS},
+    ]
+    monkeypatch.setattr(app_obras, "get_shards_despesas", lambda: shards)
+    sem_aba = app_obras.journal_append("insert_despesa", [9, 1, "2024-01-08", 10.0])
+    app_obras.journal_append("insert_despesa", [1, 1, "2024-01-08", 10.0])
+
+    app_obras.sincronizar_journal(object())
+
+    assert app_obras.journal_pendentes() == []
+    assert [e["id"] for e in app_obras.journal_rejeitadas()] == [sem_aba]
+    assert _aba_despesas(planilhas).linhas[1:] == [[1, 1, "2024-01-08", 10.0]]
+    assert app_obras.resumo_desatualizado()
+
+
+@pytest.mark.parametrize("erro", [ConnectionError("timeout"), SpreadsheetNotFound("sem acesso"), ValueError("bug")])
+def test_erro_transitorio_mantem_pendentes(journal, planilhas, monkeypatch, erro):
+    def falha(gc, nome):
+        raise erro
+
+    monkeypatch.setattr(app_obras, "get_planilha", falha)
+    id_entrada = app_obras.journal_append("insert_obra", [1, "A", 100.0, "2024-01-01"])
+
+    with pytest.raises(type(erro)):
+        app_obras.sincronizar_journal(object())
+
+    assert [e["id"] for e in app_obras.journal_pendentes()] == [id_entrada]
+    assert app_obras.journal_rejeitadas() == []
+
+
+def test_queda_antes_de_atualizar_o_resumo_marca_reconstrucao(journal, planilhas, monkeypatch):
+    def queda(planilha, gastos, valores):
+        raise SystemExit  # processo morre entre a gravação na aba e o resumo
+
+    monkeypatch.setattr(app_obras, "atualizar_resumo", queda)
+    app_obras.journal_append("insert_despesa", [1, 1, "2024-01-08", 10.0])
+    with pytest.raises(SystemExit):
+        app_obras.sincronizar_journal(object())
+
+    # Após o reinício, o reenvio não muda nada, mas o resumo continua marcado
+    app_obras.get_estado_sync.clear()
+    assert app_obras.journal_pendentes() == []
+    assert app_obras.resumo_desatualizado()
+
+
+def test_lote_completo_nao_marca_reconstrucao(journal, planilhas):
+    resumo = app_obras.get_planilha(None, app_obras.PLANILHA_NOME).add_worksheet(app_obras.ABA_RESUMO)
+    resumo.append_rows([app_obras.COLUNAS_RESUMO])
+    app_obras.journal_append("insert_obra", [1, "A", 100.0, "2024-01-01"])
+    app_obras.sincronizar_journal(object())
+    assert not app_obras.resumo_desatualizado()